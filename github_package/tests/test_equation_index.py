@@ -0,0 +1,55 @@
+"""
+Equations in the extraction JSON block survive raw and escaped LaTeX
+"""
+
+import pytest
+
+from thesis_assistant.equation_index import EquationIndex
+
+
+def answer_with_block(block):
+    return f"Here are the equations.\n\n```json\n{block}\n```\n"
+
+
+@pytest.fixture
+def index():
+    return EquationIndex(index_path=None)
+
+
+@pytest.mark.parametrize("block", [
+    # Raw LaTeX: invalid JSON escapes (\p, \m)
+    r'[{"equation": "\partial_t u + \mathbb{E}[X] = 0", "paper": "a.pdf", "page": 3}]',
+    # Properly escaped
+    r'[{"equation": "\\partial_t u + \\mathbb{E}[X] = 0", "paper": "a.pdf", "page": 3}]',
+])
+def test_invalid_escapes_are_indexed(index, block):
+    assert index.add_extraction("FBSDE", answer_with_block(block)) == 1
+    assert index.entries[0]["equation"] == r"\partial_t u + \mathbb{E}[X] = 0"
+
+
+@pytest.mark.parametrize("block", [
+    # Raw LaTeX that happens to be valid JSON (\f, \b)
+    r'[{"equation": "\frac{a}{b} = \beta", "paper": "a.pdf", "page": null}]',
+    # Properly escaped
+    r'[{"equation": "\\frac{a}{b} = \\beta", "paper": "a.pdf", "page": null}]',
+])
+def test_valid_escapes_are_not_decoded(index, block):
+    assert index.add_extraction("ratios", answer_with_block(block)) == 1
+    assert index.entries[0]["equation"] == r"\frac{a}{b} = \beta"
+
+
+def test_quotes_and_unicode_escapes_still_decode(index):
+    block = r'[{"equation": "\\sigma = 1", "context": "the \"volatility\" \u03c3"}]'
+
+    index.add_extraction("volatility", answer_with_block(block))
+
+    assert index.entries[0]["context"] == 'the "volatility" σ'
+
+
+def test_rerun_replaces_topic(index):
+    block = r'[{"equation": "\\alpha = 1", "paper": "a.pdf", "page": 1}]'
+
+    index.add_extraction("alpha", answer_with_block(block))
+    index.add_extraction("alpha", answer_with_block(block + "\n"))
+
+    assert len(index) == 1
@@ -0,0 +1,76 @@
+"""
+Papers mirror between two local directories
+"""
+
+import os
+
+import pytest
+
+from thesis_assistant.mirror import sync_papers
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    source = tmp_path / "drive"
+    local = tmp_path / "local"
+    source.mkdir()
+    (source / "a.pdf").write_bytes(b"%PDF-a")
+    (source / "b.pdf").write_bytes(b"%PDF-bb")
+    (source / "notes.txt").write_text("not a paper")
+    return source, local
+
+
+def test_first_sync_copies_papers(dirs):
+    source, local = dirs
+
+    stats = sync_papers(source, local)
+
+    assert stats == {"copied": 2, "skipped": 0, "removed": 0, "bytes": 13}
+    assert sorted(p.name for p in local.iterdir()) == ["a.pdf", "b.pdf"]
+    assert (local / "a.pdf").read_bytes() == b"%PDF-a"
+
+
+def test_unchanged_papers_are_skipped(dirs):
+    source, local = dirs
+    sync_papers(source, local)
+
+    stats = sync_papers(source, local)
+
+    assert stats == {"copied": 0, "skipped": 2, "removed": 0, "bytes": 0}
+
+
+def test_changed_paper_is_copied_again(dirs):
+    source, local = dirs
+    sync_papers(source, local)
+
+    (source / "a.pdf").write_bytes(b"%PDF-a2")
+    mtime = os.stat(local / "a.pdf").st_mtime + 10
+    os.utime(source / "a.pdf", (mtime, mtime))
+    stats = sync_papers(source, local)
+
+    assert stats["copied"] == 1
+    assert stats["skipped"] == 1
+    assert (local / "a.pdf").read_bytes() == b"%PDF-a2"
+
+
+def test_paper_deleted_from_source_is_removed(dirs):
+    source, local = dirs
+    sync_papers(source, local)
+
+    (source / "b.pdf").unlink()
+    stats = sync_papers(source, local)
+
+    assert stats["removed"] == 1
+    assert not (local / "b.pdf").exists()
+    assert (local / "a.pdf").exists()
+
+
+def test_delete_false_keeps_local_copies(dirs):
+    source, local = dirs
+    sync_papers(source, local)
+
+    (source / "b.pdf").unlink()
+    stats = sync_papers(source, local, delete=False)
+
+    assert stats["removed"] == 0
+    assert (local / "b.pdf").exists()
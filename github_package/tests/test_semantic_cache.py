@@ -0,0 +1,73 @@
+"""
+Semantic cache must not serve answers across different templated topics
+"""
+
+import pytest
+
+from thesis_assistant.claude_client import ClaudeClient
+from thesis_assistant.semantic_cache import SemanticCache
+from thesis_assistant.traffic import FakeClient
+from thesis_assistant.prompts import (
+    get_compare_papers_prompt,
+    get_extract_equations_prompt,
+    get_gap_analysis_prompt
+)
+
+
+@pytest.fixture
+def client(tmp_path):
+    client = ClaudeClient(
+        None,
+        semantic_cache=SemanticCache(threshold=0.9),
+        transport=FakeClient(latency=0)
+    )
+    client.pdf_handler.papers_dir = tmp_path
+    client.verbose = False
+    return client
+
+
+def ask(client, builder, task, text, **kwargs):
+    return client.ask(
+        builder(text), pdf_paths="all", model="sonnet",
+        task=task, cache_key=text, **kwargs
+    )
+
+
+@pytest.mark.parametrize("builder, task, first, second", [
+    (get_compare_papers_prompt, "compare_papers", "rainbow options", "barrier options"),
+    (get_gap_analysis_prompt, "find_gaps", "deep hedging", "Schrodinger bridge"),
+    (get_extract_equations_prompt, "extract_equations",
+     "Forward-Backward SDE", "Hamilton-Jacobi-Bellman equation"),
+])
+def test_different_templated_topics_do_not_hit(client, builder, task, first, second):
+    ask(client, builder, task, first)
+    result = ask(client, builder, task, second)
+
+    assert result["success"]
+    assert "cache_hit" not in result
+    assert client.semantic_cache.hits == 0
+
+
+def test_rephrased_question_hits(client):
+    ask(client, get_compare_papers_prompt, "compare_papers", "How to price rainbow options?")
+    result = ask(client, get_compare_papers_prompt, "compare_papers", "how to price Rainbow options")
+
+    assert result["cache_hit"]["prompt"] == "How to price rainbow options?"
+    assert result["cost"] == 0.0
+
+
+def test_same_text_different_task_does_not_hit(client):
+    ask(client, get_compare_papers_prompt, "compare_papers", "deep hedging")
+    result = ask(client, get_gap_analysis_prompt, "find_gaps", "deep hedging")
+
+    assert "cache_hit" not in result
+
+
+def test_use_cache_false_never_hits(client):
+    ask(client, get_extract_equations_prompt, "extract_equations", "Forward-Backward SDE",
+        use_cache=False)
+    result = ask(client, get_extract_equations_prompt, "extract_equations", "Forward-Backward SDE",
+                 use_cache=False)
+
+    assert "cache_hit" not in result
+    assert client.semantic_cache.lookups == 0
@@ -13,11 +13,14 @@ from .main import (
     ask_claude,
     quick_ask,
     review_latex,
+    review_chapter,
     compare_papers,
     extract_equations,
+    search_equations,
     find_gaps,
     list_papers,
     show_report,
+    show_slim_report,
     verify_setup,
     # Shortcuts
     qa,
@@ -31,11 +34,14 @@ __all__ = [
     "ask_claude",
     "quick_ask",
     "review_latex",
+    "review_chapter",
     "compare_papers",
     "extract_equations",
+    "search_equations",
     "find_gaps",
     "list_papers",
     "show_report",
+    "show_slim_report",
     "verify_setup",
     "qa",
     "init",
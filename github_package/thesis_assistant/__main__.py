@@ -0,0 +1,8 @@
+"""
+Command line entry point: python -m thesis_assistant run jobs.jsonl
+"""
+
+import sys
+from .batch import main
+
+sys.exit(main())
@@ -0,0 +1,251 @@
+"""
+Resumable batch runner
+
+Usage:
+    python -m thesis_assistant run jobs.jsonl [-o results.jsonl] [-j 4]
+
+Each line of jobs.jsonl is one job:
+    {"id": "q1", "task": "quick_ask", "prompt": "Summarize the papers"}
+    {"id": "c1", "task": "compare_papers", "args": {"question": "..."}}
+
+Arguments go either under "args" or as top-level keys. Results are
+appended to the output JSONL as jobs finish; a rerun skips jobs that
+already succeeded there.
+
+    python -m thesis_assistant serve [--port 8765] [--fake 1.0]
+
+starts the local HTTP service (see service.py).
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Set
+
+from . import main as assistant
+
+
+# Job "task" -> helper in main.py
+TASKS = {
+    "ask": assistant.ask_claude,
+    "ask_claude": assistant.ask_claude,
+    "quick_ask": assistant.quick_ask,
+    "review_latex": assistant.review_latex,
+    "review_chapter": assistant.review_chapter,
+    "compare_papers": assistant.compare_papers,
+    "extract_equations": assistant.extract_equations,
+    "find_gaps": assistant.find_gaps,
+}
+
+RESULT_KEYS = ["answer", "model", "input_tokens", "output_tokens", "cost", "error"]
+
+
+def job_id(job: Dict[str, Any]) -> str:
+    """Stable id: explicit "id" or a hash of the job content"""
+    if "id" in job:
+        return str(job["id"])
+    content = json.dumps(job, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()[:12]
+
+
+def load_jobs(jobs_path: str) -> List[Dict[str, Any]]:
+    """Read jobs from a JSONL file (blank lines and # comments skipped)"""
+    jobs = []
+    with open(jobs_path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                job = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{jobs_path}:{line_no}: invalid JSON ({e})")
+            if not isinstance(job, dict):
+                raise ValueError(f"{jobs_path}:{line_no}: job must be a JSON object")
+            if job.get("task") not in TASKS:
+                raise ValueError(
+                    f"{jobs_path}:{line_no}: unknown task {job.get('task')!r} "
+                    f"(available: {', '.join(sorted(TASKS))})"
+                )
+            jobs.append(job)
+    return jobs
+
+
+def load_completed(results_path: str) -> Set[str]:
+    """Ids of jobs that already succeeded in a previous run"""
+    completed = set()
+    if not os.path.exists(results_path):
+        return completed
+
+    with open(results_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Partial line from an interrupted run
+            if record.get("success"):
+                completed.add(record["id"])
+    return completed
+
+
+def run_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one job through its helper and build the result record"""
+    args = job.get("args")
+    if args is None:
+        args = {k: v for k, v in job.items() if k not in ("id", "task")}
+
+    start = time.time()
+    try:
+        result = TASKS[job["task"]](**args, show_response=False)
+    except Exception as e:
+        result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+
+    if result is None:
+        result = {"success": False, "error": "not initialized"}
+
+    record = {"id": job_id(job), "task": job["task"], "success": bool(result.get("success"))}
+    record.update({k: result[k] for k in RESULT_KEYS if k in result})
+    record["elapsed"] = round(time.time() - start, 2)
+    return record
+
+
+def run_batch(
+    jobs_path: str,
+    results_path: str = None,
+    concurrency: int = 4
+) -> Dict[str, Any]:
+    """
+    Run all pending jobs and append results as they finish
+
+    Args:
+        jobs_path: JSONL file with jobs
+        results_path: JSONL output / checkpoint (default: <jobs>.results.jsonl)
+        concurrency: Number of jobs in flight
+
+    Returns:
+        Summary dict with counts, cost and throughput
+    """
+    if results_path is None:
+        results_path = os.path.splitext(jobs_path)[0] + ".results.jsonl"
+
+    jobs = load_jobs(jobs_path)
+    completed = load_completed(results_path)
+    pending = [job for job in jobs if job_id(job) not in completed]
+
+    print(f"📋 {len(jobs)} jobs: {len(jobs) - len(pending)} already done, "
+          f"{len(pending)} to run (concurrency {concurrency})")
+    print(f"💾 Results: {results_path}\n")
+
+    summary = {"total": len(pending), "succeeded": 0, "failed": 0, "cost": 0.0}
+    if not pending:
+        return summary
+
+    start = time.time()
+
+    with open(results_path, "a", encoding="utf-8") as out, \
+            ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = [pool.submit(run_job, job) for job in pending]
+
+        for done, future in enumerate(as_completed(futures), 1):
+            record = future.result()
+
+            # Checkpoint: one line per finished job, flushed immediately
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            os.fsync(out.fileno())
+
+            summary["succeeded" if record["success"] else "failed"] += 1
+            summary["cost"] += record.get("cost") or 0.0
+
+            elapsed = time.time() - start
+            icon = "✅" if record["success"] else "❌"
+            print(f"{icon} [{done}/{len(pending)}] {record['id']} ({record['elapsed']:.1f}s) | "
+                  f"{done / elapsed * 60:.1f} jobs/min | ${summary['cost']:.4f} total")
+
+    summary["elapsed"] = time.time() - start
+    summary["jobs_per_min"] = len(pending) / summary["elapsed"] * 60
+
+    print(f"\n{'='*60}")
+    print(f"🏁 Done: {summary['succeeded']} succeeded, {summary['failed']} failed")
+    print(f"⏱️  {summary['elapsed']:.1f}s ({summary['jobs_per_min']:.1f} jobs/min)")
+    print(f"💰 Cost: ${summary['cost']:.4f}")
+    print(f"{'='*60}")
+
+    return summary
+
+
+def main(argv: List[str] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(
+        prog="python -m thesis_assistant",
+        description="Thesis Assistant batch runner"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run jobs from a JSONL file")
+    run.add_argument("jobs", help="Jobs JSONL file")
+    run.add_argument("-o", "--output", help="Results JSONL (default: <jobs>.results.jsonl)")
+    run.add_argument("-j", "--concurrency", type=int, default=4, help="Jobs in flight (default: 4)")
+    run.add_argument("--slim-pdfs", action="store_true", help="Upload slim PDF copies")
+    traffic = run.add_mutually_exclusive_group()
+    traffic.add_argument("--record", metavar="PATH", help="Record API traffic to PATH")
+    traffic.add_argument("--replay", metavar="PATH", help="Replay API traffic from PATH (offline)")
+    run.add_argument("--latency-scale", type=float, default=1.0,
+                     help="Replay latency multiplier, 0 = instant (default: 1.0)")
+    run.add_argument("--replay-strict", action="store_true",
+                     help="Fail requests with no recording instead of replaying another")
+
+    serve = commands.add_parser("serve", help="Run the local HTTP service")
+    serve.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=8765, help="Port (default: 8765)")
+    serve.add_argument("--workers", type=int, default=4, help="API calls in flight (default: 4)")
+    serve.add_argument("--queue", type=int, default=32, help="Waiting requests (default: 32)")
+    serve.add_argument("--semantic-cache", action="store_true", help="Reuse near-duplicate answers")
+    backend = serve.add_mutually_exclusive_group()
+    backend.add_argument("--fake", type=float, metavar="SECONDS",
+                         help="Fake API backend with this latency (load tests)")
+    backend.add_argument("--replay", metavar="PATH", help="Replay recorded API traffic")
+    serve.add_argument("--replay-strict", action="store_true",
+                       help="Fail requests with no recording instead of replaying another")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        from .service import serve as run_service
+        traffic = "fake" if args.fake is not None else "replay" if args.replay else None
+        run_service(
+            args.host, args.port, args.workers, args.queue,
+            semantic_cache=args.semantic_cache,
+            traffic=traffic,
+            traffic_path=args.replay,
+            latency_scale=args.fake if args.fake is not None else 1.0,
+            replay_strict=args.replay_strict
+        )
+        return 0
+
+    traffic_mode = "record" if args.record else "replay" if args.replay else None
+    if not assistant.initialize(
+        slim_pdfs=args.slim_pdfs,
+        traffic=traffic_mode,
+        traffic_path=args.record or args.replay,
+        latency_scale=args.latency_scale,
+        replay_strict=args.replay_strict
+    ):
+        return 1
+
+    # Jobs run concurrently: the progress line per job is the only output
+    assistant._client.verbose = False
+    assistant._pdf_handler.verbose = False
+
+    summary = run_batch(args.jobs, args.output, args.concurrency)
+
+    replay = assistant._tracker.replay
+    if replay is not None:
+        print(f"📼 Replay: {replay.matched} matched, {replay.unmatched} unmatched")
+        if replay.unmatched and not args.replay_strict:
+            print("⚠️  Unmatched requests got unrelated recordings "
+                  "(use --replay-strict to fail them)")
+    return 0 if summary["failed"] == 0 else 2
@@ -0,0 +1,96 @@
+"""
+Acceptance checks for cascade execution (Sonnet first, Opus on failure)
+"""
+
+import re
+from typing import List, Optional
+
+
+class AcceptanceCheck:
+    """Base check: accepts everything"""
+
+    # Extra instruction appended to the prompt of the cheap call
+    prompt_suffix = ""
+
+    def check(self, answer: str) -> bool:
+        """Return True if the cheap model's answer is good enough"""
+        return True
+
+    def clean(self, answer: str) -> str:
+        """Remove any check-specific markup from an accepted answer"""
+        return answer
+
+    def __call__(self, answer: str) -> bool:
+        return bool(answer) and self.check(answer)
+
+
+class MinLengthCheck(AcceptanceCheck):
+    """Accept answers with at least min_chars characters"""
+
+    def __init__(self, min_chars: int = 200):
+        self.min_chars = min_chars
+
+    def check(self, answer: str) -> bool:
+        return len(answer.strip()) >= self.min_chars
+
+
+class StructureCheck(AcceptanceCheck):
+    """Accept answers matching all given regex patterns"""
+
+    def __init__(self, patterns: List[str]):
+        self.patterns = [re.compile(p, re.MULTILINE | re.IGNORECASE) for p in patterns]
+
+    def check(self, answer: str) -> bool:
+        return all(p.search(answer) for p in self.patterns)
+
+
+class ConfidenceCheck(AcceptanceCheck):
+    """Accept answers whose self-graded confidence reaches a threshold"""
+
+    # Tolerates case, markdown emphasis and trailing punctuation,
+    # e.g. "**Confidence: 0.9**" or "CONFIDENCE: 0.90."
+    PATTERN = re.compile(
+        r"^[\s*_>#-]*confidence[\s*_]*:[\s*_]*([01](?:\.\d+)?)[\s*_.!)]*$",
+        re.MULTILINE | re.IGNORECASE
+    )
+
+    prompt_suffix = (
+        "\n\nOn the very last line, rate how confident you are that this answer "
+        "is complete and correct, as 'CONFIDENCE: <number between 0 and 1>'."
+    )
+
+    def __init__(self, threshold: float = 0.8):
+        self.threshold = threshold
+
+    def confidence(self, answer: str) -> Optional[float]:
+        """Parse self-graded confidence, None if missing"""
+        matches = self.PATTERN.findall(answer)
+        return float(matches[-1]) if matches else None
+
+    def check(self, answer: str) -> bool:
+        confidence = self.confidence(answer)
+        return confidence is not None and confidence >= self.threshold
+
+    def clean(self, answer: str) -> str:
+        return self.PATTERN.sub("", answer).rstrip()
+
+
+class AllChecks(AcceptanceCheck):
+    """Accept only if every check accepts"""
+
+    def __init__(self, *checks: AcceptanceCheck):
+        self.checks = checks
+        self.prompt_suffix = "".join(c.prompt_suffix for c in checks)
+
+    def check(self, answer: str) -> bool:
+        return all(c.check(answer) for c in self.checks)
+
+    def clean(self, answer: str) -> str:
+        for c in self.checks:
+            answer = c.clean(answer)
+        return answer
+
+
+def default_check() -> AcceptanceCheck:
+    """Self-graded confidence >= 0.8 and a non-trivial length"""
+    return AllChecks(ConfidenceCheck(0.8), MinLengthCheck(200))
@@ -2,10 +2,30 @@
 Claude API client wrapper
 """
 
+import os
+import time
 import anthropic
+from pathlib import Path
 from typing import Optional, List, Dict, Any
-from .config import MODELS, PRICING, DEFAULT_MAX_TOKENS, DEFAULT_TEMPERATURE
+from .config import (
+    get_api_key,
+    MODELS,
+    PRICING,
+    DEFAULT_MAX_TOKENS,
+    DEFAULT_TEMPERATURE,
+    PAPERS_DIR,
+    MIRROR_PAPERS,
+    LOCAL_PAPERS_DIR,
+    SEMANTIC_CACHE,
+    SEMANTIC_CACHE_THRESHOLD,
+    TRAFFIC_MODE,
+    TRAFFIC_PATH
+)
 from .pdf_handler import PDFHandler
+from .cascade import AcceptanceCheck, default_check
+from .semantic_cache import SemanticCache
+from .mirror import sync_papers
+from .traffic import RecordingClient, ReplayClient, FakeClient
 
 
 class ClaudeClient:
@@ -19,15 +39,33 @@ class ClaudeClient:
         "xem xét kỹ", "phân tích sâu"
     ]
     
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        semantic_cache: Optional[SemanticCache] = None,
+        transport=None
+    ):
         """
         Initialize Claude client
         
         Args:
             api_key: Anthropic API key
+            semantic_cache: Optional cache for near-duplicate prompts
+            transport: Object with messages.create() used instead of
+                the real API (e.g. traffic.ReplayClient)
         """
-        self.client = anthropic.Anthropic(api_key=api_key)
+        if transport is not None:
+            self.client = transport
+        else:
+            self.client = anthropic.Anthropic(api_key=api_key)
         self.pdf_handler = PDFHandler()
+        self.semantic_cache = semantic_cache
+        self.verbose = True  # Progress output (off in service mode)
+    
+    def _log(self, message: str = "", verbose: Optional[bool] = None):
+        """Print progress unless running quietly (per call or client-wide)"""
+        if self.verbose if verbose is None else verbose:
+            print(message)
     
     def auto_detect_model(self, prompt: str) -> str:
         """
@@ -74,7 +112,13 @@ class ClaudeClient:
         pdf_paths: Optional[any] = None,
         model: str = "auto",
         max_tokens: int = DEFAULT_MAX_TOKENS,
-        temperature: float = DEFAULT_TEMPERATURE
+        temperature: float = DEFAULT_TEMPERATURE,
+        cascade: bool = False,
+        accept: Optional[AcceptanceCheck] = None,
+        use_cache: bool = True,
+        task: str = "ask",
+        cache_key: Optional[str] = None,
+        verbose: Optional[bool] = None
     ) -> Dict[str, Any]:
         """
         Ask Claude with papers context
@@ -85,9 +129,21 @@ class ClaudeClient:
             model: "auto", "sonnet", or "opus"
             max_tokens: Response length
             temperature: Creativity (0-1)
+            cascade: If Opus is selected, try Sonnet first and
+                escalate to Opus only if the answer fails `accept`
+            accept: Acceptance check for cascade (default: self-graded
+                confidence >= 0.8 and minimum length)
+            use_cache: Allow answers from the semantic cache (if enabled)
+            task: Prompt template name; cache hits never cross tasks
+            cache_key: User-supplied part of a templated prompt (question,
+                topic) compared by the semantic cache; default: prompt
+            verbose: Progress output for this call (default: self.verbose);
+                pass False instead of changing a shared client
             
         Returns:
             Dict with response, tokens, cost, model used
+            (plus "cascade" info when cascade ran, "cache_hit"
+            when served from the semantic cache)
         """
         # Resolve PDF paths
         resolved_paths = self.pdf_handler.resolve_pdf_paths(pdf_paths)
@@ -95,23 +151,116 @@ class ClaudeClient:
         # Auto-detect model
         if model == "auto":
             model = self.auto_detect_model(prompt)
-            print(f"🤖 Auto-selected: {model.upper()}")
+            self._log(f"🤖 Auto-selected: {model.upper()}", verbose=verbose)
         
-        model_name = MODELS[model]
+        # Near-duplicate question for the same task, model and papers?
+        # Only the user-supplied text is compared, not the template.
+        cache = self.semantic_cache if use_cache else None
+        cache_text = cache_key if cache_key is not None else prompt
+        scope = (task, model, tuple(sorted(Path(p).name for p in resolved_paths)))
+        if cache is not None:
+            hit = cache.lookup(cache_text, scope)
+            if hit is not None:
+                entry, similarity = hit
+                self._log(f"♻️  Semantic cache hit (similarity {similarity:.2f}): "
+                          f"{entry['prompt'][:60]!r}", verbose=verbose)
+                result = dict(entry["result"])
+                result.pop("cascade", None)
+                result.update(
+                    cost=0.0,
+                    input_tokens=0,
+                    output_tokens=0,
+                    latency=0.0,
+                    cache_hit={"similarity": similarity, "prompt": entry["prompt"]}
+                )
+                return result
         
         # Print info
-        print(f"\n{'='*60}")
-        print(f"🔵 Model: {model.upper()}")
-        print(f"📚 Papers: {len(resolved_paths)}")
-        print(f"💬 Prompt length: {len(prompt)} chars")
-        print(f"{'='*60}\n")
+        self._log(f"\n{'='*60}", verbose=verbose)
+        self._log(f"🔵 Model: {model.upper()}{' (cascade)' if cascade and model == 'opus' else ''}",
+                  verbose=verbose)
+        self._log(f"📚 Papers: {len(resolved_paths)}", verbose=verbose)
+        self._log(f"💬 Prompt length: {len(prompt)} chars", verbose=verbose)
+        self._log(f"{'='*60}\n", verbose=verbose)
         
         # Build content
-        content = self.pdf_handler.build_content(prompt, resolved_paths)
+        content = self.pdf_handler.build_content(prompt, resolved_paths, verbose=verbose)
+        
+        if not (cascade and model == "opus"):
+            result = self._call(model, content, max_tokens, temperature, verbose)
+            if cache is not None and result["success"]:
+                cache.store(cache_text, scope, result)
+            return result
+        
+        # Cascade: cheap model first, with the check's extra instruction
+        accept = accept or default_check()
+        cheap_content = content[:-1] + [
+            {"type": "text", "text": prompt + accept.prompt_suffix}
+        ]
+        cheap = self._call("sonnet", cheap_content, max_tokens, temperature, verbose)
+        
+        if cheap["success"] and accept(cheap["answer"]):
+            self._log("✅ Cascade: Sonnet answer accepted", verbose=verbose)
+            cheap["answer"] = accept.clean(cheap["answer"])
+            if cache is not None:
+                cache.store(cache_text, scope, cheap)
+            cheap["cascade"] = {
+                "escalated": False,
+                "opus_cost_estimate": self.calculate_cost(
+                    MODELS["opus"], cheap["input_tokens"], cheap["output_tokens"]
+                )
+            }
+            return cheap
+        
+        self._log("⬆️  Cascade: escalating to Opus", verbose=verbose)
+        result = self._call("opus", content, max_tokens, temperature, verbose)
+        
+        if result["success"]:
+            result["cascade"] = {
+                "escalated": True,
+                "sonnet_cost": cheap.get("cost", 0.0),
+                "sonnet_latency": cheap.get("latency", 0.0)
+            }
+            # The rejected Sonnet call was paid for too
+            result["input_tokens"] += cheap.get("input_tokens", 0)
+            result["output_tokens"] += cheap.get("output_tokens", 0)
+            result["cost"] += cheap.get("cost", 0.0)
+            result["latency"] += cheap.get("latency", 0.0)
+            
+            if cache is not None:
+                cache.store(cache_text, scope, result)
+        elif cheap["success"]:
+            # Opus failed, but the rejected Sonnet call was still paid for
+            result.update(
+                model="sonnet",
+                input_tokens=cheap["input_tokens"],
+                output_tokens=cheap["output_tokens"],
+                cost=cheap["cost"],
+                latency=cheap["latency"],
+                cascade={
+                    "escalated": True,
+                    "sonnet_cost": cheap["cost"],
+                    "sonnet_latency": cheap["latency"]
+                }
+            )
+        
+        return result
+    
+    def _call(
+        self,
+        model: str,
+        content: List[dict],
+        max_tokens: int,
+        temperature: float,
+        verbose: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """Single messages.create call, timed"""
+        model_name = MODELS[model]
         
         # Call API
-        print("⏳ Calling Claude API...\n")
+        self._log("⏳ Calling Claude API...\n", verbose=verbose)
         
+        start = time.time()
         try:
             response = self.client.messages.create(
                 model=model_name,
@@ -132,13 +281,71 @@ class ClaudeClient:
                 "input_tokens": input_tokens,
                 "output_tokens": output_tokens,
                 "cost": cost,
+                "latency": time.time() - start,
                 "success": True
             }
             
         except Exception as e:
-            print(f"❌ Error: {e}")
+            self._log(f"❌ Error: {e}", verbose=verbose)
             return {
                 "answer": None,
                 "error": str(e),
                 "success": False
             }
+
+
+def create_client(
+    slim_pdfs: bool = False,
+    mirror: bool = MIRROR_PAPERS,
+    semantic_cache: bool = SEMANTIC_CACHE,
+    cache_threshold: float = SEMANTIC_CACHE_THRESHOLD,
+    traffic: str = TRAFFIC_MODE,
+    traffic_path: str = TRAFFIC_PATH,
+    latency_scale: float = 1.0,
+    replay_strict: bool = False
+) -> ClaudeClient:
+    """
+    Build a configured client (used by initialize() and the HTTP service)
+    
+    Args: see main.initialize()
+    
+    Returns:
+        ClaudeClient with transport, semantic cache and papers set up
+        
+    Raises:
+        ValueError: unknown traffic mode or missing API key
+    """
+    api_key = get_api_key() if traffic not in ("replay", "fake") else None
+    cache = SemanticCache(cache_threshold) if semantic_cache else None
+    
+    transport = None
+    if traffic == "replay":
+        transport = ReplayClient(
+            traffic_path, latency_scale=latency_scale, strict=replay_strict
+        )
+    elif traffic == "fake":
+        transport = FakeClient(latency=latency_scale)
+    elif traffic not in (None, "record"):
+        raise ValueError(f"Unknown traffic mode {traffic!r} (use 'record', 'replay' or 'fake')")
+    
+    client = ClaudeClient(api_key, semantic_cache=cache, transport=transport)
+    
+    if traffic == "record":
+        client.client = RecordingClient(client.client, traffic_path)
+    if traffic in ("record", "replay"):
+        print(f"📼 Traffic {traffic}: {traffic_path}")
+    elif traffic == "fake":
+        print(f"🧪 Fake API backend ({latency_scale:.1f}s per call)")
+    client.pdf_handler.slim = slim_pdfs
+    
+    if mirror and os.path.isdir(PAPERS_DIR):
+        try:
+            stats = sync_papers(PAPERS_DIR, LOCAL_PAPERS_DIR)
+            client.pdf_handler.papers_dir = Path(LOCAL_PAPERS_DIR)
+            print(f"🪞 Mirrored papers to {LOCAL_PAPERS_DIR}: "
+                  f"{stats['copied']} copied ({stats['bytes'] / 1024 / 1024:.1f} MB), "
+                  f"{stats['skipped']} unchanged, {stats['removed']} removed")
+        except OSError as e:
+            print(f"⚠️  Mirror failed, reading from Drive: {e}")
+    
+    return client
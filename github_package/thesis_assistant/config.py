@@ -10,11 +10,13 @@ from pathlib import Path
 # ============================================
 
 def get_api_key():
-    """Get API key from Colab Secrets"""
+    """Get API key from Colab Secrets or ANTHROPIC_API_KEY env variable"""
     try:
         from google.colab import userdata
         return userdata.get('ANTHROPIC_API_KEY')
     except:
+        if os.environ.get('ANTHROPIC_API_KEY'):
+            return os.environ['ANTHROPIC_API_KEY']
         raise ValueError(
             "API Key not found! "
             "Add ANTHROPIC_API_KEY to Colab Secrets (left panel 🔑)"
@@ -27,6 +29,10 @@ def get_api_key():
 DRIVE_ROOT = "/content/drive/MyDrive/PHD_SBTS"
 PAPERS_DIR = DRIVE_ROOT
 
+# Local-disk copy of PAPERS_DIR, synced at initialize() (Drive FUSE is slow)
+MIRROR_PAPERS = True
+LOCAL_PAPERS_DIR = "/content/papers_local"
+
 # ============================================
 # MODELS
 # ============================================
@@ -49,3 +55,29 @@ PRICING = {
 DEFAULT_MAX_TOKENS = 4096
 DEFAULT_TEMPERATURE = 1.0
 DEFAULT_MODEL = "auto"
+
+# Try Sonnet first and escalate to Opus only when the answer fails
+# the acceptance check (see cascade.py)
+CASCADE = False
+
+# Reuse answers of near-duplicate prompts over the same papers
+SEMANTIC_CACHE = False
+SEMANTIC_CACHE_THRESHOLD = 0.9  # cosine similarity of char n-gram TF-IDF
+
+# Record/replay of API traffic: None, "record" or "replay"
+TRAFFIC_MODE = None
+TRAFFIC_PATH = "/content/thesis_traffic.jsonl"
+
+# ============================================
+# LOCAL INDEXES
+# ============================================
+
+EQUATION_INDEX_PATH = os.path.join(DRIVE_ROOT, ".thesis_assistant", "equations.json")
+
+# ============================================
+# PDF SLIMMING
+# ============================================
+
+SLIM_CACHE_DIR = "/tmp/thesis_assistant/slim"
+SLIM_MAX_IMAGE_DIM = 1200  # px, longest side
+SLIM_IMAGE_QUALITY = 60  # JPEG quality
@@ -3,7 +3,8 @@ Cost and usage tracking
 """
 
 import datetime
-from typing import List, Dict, Any
+import threading
+from typing import List, Dict, Any, Optional
 
 
 class CostTracker:
@@ -12,6 +13,9 @@ class CostTracker:
     def __init__(self):
         self.history: List[Dict[str, Any]] = []
         self.session_start = None
+        self.semantic_cache = None  # Set by initialize() when enabled
+        self.replay = None  # ReplayClient, set by initialize() on replay
+        self._lock = threading.Lock()
     
     def add(
         self, 
@@ -19,26 +23,33 @@ class CostTracker:
         input_tokens: int, 
         output_tokens: int, 
         cost: float,
-        question_preview: str
+        question_preview: str,
+        latency: Optional[float] = None,
+        cascade: Optional[Dict[str, Any]] = None
     ):
         """Add a query to history"""
-        if self.session_start is None:
-            self.session_start = datetime.datetime.now()
-        
-        self.history.append({
-            "timestamp": datetime.datetime.now(),
-            "model": model.upper(),
-            "input": input_tokens,
-            "output": output_tokens,
-            "cost": cost,
-            "question": (question_preview[:50] + "...") 
-                       if len(question_preview) > 50 
-                       else question_preview
-        })
+        with self._lock:
+            if self.session_start is None:
+                self.session_start = datetime.datetime.now()
+            
+            self.history.append({
+                "timestamp": datetime.datetime.now(),
+                "model": model.upper(),
+                "input": input_tokens,
+                "output": output_tokens,
+                "cost": cost,
+                "latency": latency,
+                "cascade": cascade,
+                "question": (question_preview[:50] + "...") 
+                           if len(question_preview) > 50 
+                           else question_preview
+            })
     
     def get_summary(self) -> Dict[str, Any]:
         """Get session summary statistics"""
-        if not self.history:
+        if not (self.history or
+                (self.semantic_cache and self.semantic_cache.lookups) or
+                (self.replay and self.replay.matched + self.replay.unmatched)):
             return None
         
         total_cost = sum(h['cost'] for h in self.history)
@@ -53,6 +64,31 @@ class CostTracker:
         total_input = sum(h['input'] for h in self.history)
         total_output = sum(h['output'] for h in self.history)
         
+        cascaded = [h for h in self.history if h.get('cascade')]
+        escalated = [h for h in cascaded if h['cascade']['escalated']]
+        accepted = [h for h in cascaded if not h['cascade']['escalated']]
+        
+        # Accepted: saved the Opus price of the same tokens.
+        # Escalated: the rejected Sonnet call was extra.
+        cost_saved = (
+            sum(h['cascade']['opus_cost_estimate'] - h['cost'] for h in accepted) -
+            sum(h['cascade']['sonnet_cost'] for h in escalated)
+        )
+        
+        # Latency saved needs an observed Opus latency to compare against
+        opus_latencies = [
+            h['latency'] - (h['cascade']['sonnet_latency'] if h.get('cascade') else 0.0)
+            for h in self.history
+            if 'OPUS' in h['model'] and h.get('latency') is not None
+        ]
+        latency_saved = None
+        if opus_latencies:
+            mean_opus = sum(opus_latencies) / len(opus_latencies)
+            latency_saved = (
+                sum(mean_opus - h['latency'] for h in accepted if h.get('latency') is not None) -
+                sum(h['cascade']['sonnet_latency'] for h in escalated)
+            )
+        
         return {
             "total_cost": total_cost,
             "total_queries": total_queries,
@@ -61,7 +97,18 @@ class CostTracker:
             "sonnet_cost": sonnet_cost,
             "opus_cost": opus_cost,
             "total_input_tokens": total_input,
-            "total_output_tokens": total_output
+            "total_output_tokens": total_output,
+            "cascade_queries": len(cascaded),
+            "cascade_escalated": len(escalated),
+            "escalation_rate": len(escalated) / len(cascaded) if cascaded else None,
+            "cascade_cost_saved": cost_saved,
+            "cascade_latency_saved": latency_saved,
+            "cache_lookups": self.semantic_cache.lookups if self.semantic_cache else 0,
+            "cache_hits": self.semantic_cache.hits if self.semantic_cache else 0,
+            "cache_hit_rate": self.semantic_cache.hit_rate if self.semantic_cache else None,
+            "cache_threshold": self.semantic_cache.threshold if self.semantic_cache else None,
+            "replay_matched": self.replay.matched if self.replay else None,
+            "replay_unmatched": self.replay.unmatched if self.replay else None
         }
     
     def report(self):
@@ -85,6 +132,27 @@ class CostTracker:
         print(f"   Output: {summary['total_output_tokens']:,} tokens")
         print(f"   Total:  {summary['total_input_tokens'] + summary['total_output_tokens']:,} tokens")
         
+        if summary['cascade_queries']:
+            latency = summary['cascade_latency_saved']
+            print(f"\n🪜 Cascade (Sonnet → Opus):")
+            print(f"   Queries:    {summary['cascade_queries']}")
+            print(f"   Escalated:  {summary['cascade_escalated']} "
+                  f"({summary['escalation_rate']:.0%})")
+            print(f"   Cost saved: ${summary['cascade_cost_saved']:.4f} (est.)")
+            print(f"   Time saved: " +
+                  (f"{latency:.1f}s (est.)" if latency is not None else "n/a (no Opus timings yet)"))
+        
+        if summary['cache_lookups']:
+            print(f"\n♻️  Semantic Cache (threshold {summary['cache_threshold']:.2f}):")
+            print(f"   Hits: {summary['cache_hits']}/{summary['cache_lookups']} "
+                  f"({summary['cache_hit_rate']:.0%})")
+        
+        if summary['replay_matched'] is not None:
+            print(f"\n📼 Replay: {summary['replay_matched']} matched, "
+                  f"{summary['replay_unmatched']} unmatched"
+                  + (" ⚠️  (answers may not fit their requests)"
+                     if summary['replay_unmatched'] else ""))
+        
         print("\n" + "="*70)
         print("📋 Recent Queries:")
         print("="*70)
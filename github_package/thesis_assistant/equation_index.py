@@ -0,0 +1,289 @@
+"""
+Local equation index with offline search
+"""
+
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+from .config import EQUATION_INDEX_PATH
+
+
+# Display math blocks in free-form answers (fallback when no JSON block)
+LATEX_BLOCK_PATTERN = re.compile(
+    r"\$\$(.+?)\$\$|\\\[(.+?)\\\]|\\begin\{(equation|align|gather)\*?\}(.+?)\\end\{\3\*?\}",
+    re.DOTALL
+)
+JSON_BLOCK_PATTERN = re.compile(r"```json\s*(.+?)```", re.DOTALL)
+
+# Escaped backslash pair, or a lone backslash that is not a JSON escape
+# we expect from the model (raw LaTeX such as \frac, \beta, \partial)
+LONE_BACKSLASH_PATTERN = re.compile(r'\\\\|\\(?!["/]|u[0-9a-fA-F]{4})')
+
+# Characters that mark a line of PDF text as probably mathematical
+MATH_CHARS = set("=∑∫∂√≤≥≈∈∇λσμπθΣΠΔ^_")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens (unicode-aware, so Vietnamese works)"""
+    return re.findall(r"\w+", text.lower())
+
+
+class EquationIndex:
+    """Index of equations from past extraction runs and local PDF text"""
+
+    def __init__(self, index_path: Optional[str] = EQUATION_INDEX_PATH):
+        self.index_path = Path(index_path) if index_path else None
+        self.entries: List[Dict[str, Any]] = []
+        self.topics: List[str] = []
+        self.indexed_pdfs: Dict[str, float] = {}  # path -> mtime
+        self._lock = threading.Lock()
+        self.load()
+
+    # ----------------------------------------
+    # Persistence
+    # ----------------------------------------
+
+    def load(self):
+        """Load index from disk if it exists"""
+        if self.index_path is None or not self.index_path.exists():
+            return
+
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except ValueError as e:
+            print(f"⚠️  Equation index {self.index_path} is corrupt ({e}) - starting empty")
+            return
+
+        self.entries = data.get("entries", [])
+        self.topics = data.get("topics", [])
+        self.indexed_pdfs = data.get("indexed_pdfs", {})
+
+    def save(self):
+        """Write index to disk"""
+        if self.index_path is None:
+            return
+
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(".tmp")
+
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "entries": self.entries,
+                "topics": self.topics,
+                "indexed_pdfs": self.indexed_pdfs
+            }, f, ensure_ascii=False, indent=1)
+
+        os.replace(tmp_path, self.index_path)
+
+    # ----------------------------------------
+    # Building
+    # ----------------------------------------
+
+    def add_extraction(self, topic: str, answer: str) -> int:
+        """
+        Add equations from an extract_equations() answer
+
+        Args:
+            topic: Topic the extraction was run for
+            answer: Claude's answer text
+
+        Earlier extraction entries for the same topic are replaced.
+
+        Returns:
+            Number of equations added
+        """
+        items = self._parse_json_block(answer)
+
+        if items is None:
+            # No structured block: fall back to display math in the text
+            items = []
+            for match in LATEX_BLOCK_PATTERN.finditer(answer):
+                latex = match.group(1) or match.group(2) or match.group(4)
+                start = max(0, match.start() - 200)
+                items.append({
+                    "equation": latex.strip(),
+                    "context": answer[start:match.start()].strip()[-200:]
+                })
+
+        new_entries = []
+        seen = set()
+        for item in items:
+            entry = {
+                "equation": str(item.get("equation", "")).strip(),
+                "paper": item.get("paper"),
+                "page": item.get("page"),
+                "context": item.get("context", ""),
+                "topic": topic,
+                "source": "extraction"
+            }
+            key = (entry["equation"], entry["paper"], entry["page"])
+            if key not in seen:
+                seen.add(key)
+                new_entries.append(entry)
+
+        with self._lock:
+            # Rerunning a topic replaces its previous extraction
+            self.entries = [
+                e for e in self.entries
+                if not (e["source"] == "extraction" and e["topic"] == topic)
+            ]
+            self.entries.extend(new_entries)
+
+            if topic not in self.topics:
+                self.topics.append(topic)
+
+            self.save()
+
+        return len(new_entries)
+
+    def add_pdf_text(self, pdf_paths: List[str]) -> int:
+        """
+        Index equation-like lines from the text layer of local PDFs
+
+        Needs pypdf; PDFs unchanged since the last run are skipped.
+
+        Args:
+            pdf_paths: List of PDF paths
+
+        Returns:
+            Number of lines added
+        """
+        try:
+            from pypdf import PdfReader
+        except ImportError:
+            print("⚠️  pypdf not installed - skipping PDF text indexing (pip install pypdf)")
+            return 0
+
+        added = 0
+
+        for pdf_path in pdf_paths:
+            key = str(pdf_path)
+            mtime = os.path.getmtime(pdf_path)
+            if self.indexed_pdfs.get(key) == mtime:
+                continue
+
+            new_entries = []
+            try:
+                reader = PdfReader(pdf_path)
+                for page_no, page in enumerate(reader.pages, 1):
+                    lines = (page.extract_text() or "").splitlines()
+                    for i, line in enumerate(lines):
+                        if not self._looks_like_math(line):
+                            continue
+                        context = " ".join(lines[max(0, i - 2):i + 3])
+                        new_entries.append({
+                            "equation": line.strip(),
+                            "paper": Path(pdf_path).name,
+                            "page": page_no,
+                            "context": context.strip(),
+                            "topic": None,
+                            "source": "pdf"
+                        })
+            except Exception as e:
+                print(f"⚠️  Could not read {Path(pdf_path).name}: {e}")
+                continue
+
+            with self._lock:
+                # Drop stale entries for this paper before re-adding
+                name = Path(pdf_path).name
+                self.entries = [
+                    e for e in self.entries
+                    if not (e["source"] == "pdf" and e["paper"] == name)
+                ]
+                self.entries.extend(new_entries)
+                self.indexed_pdfs[key] = mtime
+
+            added += len(new_entries)
+
+        with self._lock:
+            self.save()
+
+        return added
+
+    # ----------------------------------------
+    # Search
+    # ----------------------------------------
+
+    def is_covered(self, query: str) -> bool:
+        """Check whether a past extraction run covers this query"""
+        query_tokens = set(tokenize(query))
+        if not query_tokens:
+            return False
+
+        return any(query_tokens <= set(tokenize(t)) for t in self.topics)
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Rank indexed equations by token overlap with the query
+
+        Args:
+            query: Search text, e.g. "Forward-Backward SDE"
+            limit: Maximum results
+
+        Returns:
+            Entries with an added "score" (0-1), best first
+        """
+        query_tokens = set(tokenize(query))
+        if not query_tokens:
+            return []
+
+        hits = []
+        for entry in self.entries:
+            text = " ".join(str(entry.get(k) or "") for k in
+                            ("equation", "context", "topic", "paper"))
+            score = len(query_tokens & set(tokenize(text))) / len(query_tokens)
+            if score > 0:
+                hits.append(dict(entry, score=score))
+
+        # Prefer curated extraction results on ties
+        hits.sort(key=lambda h: (h["score"], h["source"] == "extraction"), reverse=True)
+        return hits[:limit]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    # ----------------------------------------
+    # Helpers
+    # ----------------------------------------
+
+    @staticmethod
+    def _escape_latex(block: str) -> str:
+        """Double lone backslashes so raw LaTeX survives json.loads"""
+        return LONE_BACKSLASH_PATTERN.sub(
+            lambda m: m.group(0) if m.group(0) == "\\\\" else "\\\\", block
+        )
+
+    @classmethod
+    def _parse_json_block(cls, answer: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Return the equation list from a ```json block, or None
+
+        Models often paste raw LaTeX into the JSON strings. "\\partial"
+        is invalid JSON and "\\frac" / "\\beta" would silently decode to
+        control characters, so lone backslashes are escaped first.
+        """
+        for match in JSON_BLOCK_PATTERN.finditer(answer):
+            block = match.group(1)
+            for text in (cls._escape_latex(block), block):
+                try:
+                    data = json.loads(text)
+                    break
+                except ValueError:
+                    continue
+            else:
+                continue
+            if isinstance(data, list):
+                return [d for d in data if isinstance(d, dict) and d.get("equation")]
+        return None
+
+    @staticmethod
+    def _looks_like_math(line: str) -> bool:
+        """Heuristic: short line with '=' and at least one other math symbol"""
+        line = line.strip()
+        if not (3 <= len(line) <= 200) or "=" not in line:
+            return False
+        return sum(1 for c in line if c in MATH_CHARS) >= 2
@@ -0,0 +1,129 @@
+"""
+LaTeX section splitting and review caching for chapter-level review
+"""
+
+import hashlib
+import re
+import threading
+from typing import List, Dict, Any, Optional
+
+
+# Matches \section{...}, \subsection{...} and their starred forms
+SECTION_PATTERN = re.compile(
+    r"^[ \t]*\\(section|subsection)\*?\s*(?:\[[^\]]*\])?\s*\{([^}]*)\}",
+    re.MULTILINE
+)
+
+
+def split_latex_sections(latex_text: str) -> List[Dict[str, str]]:
+    """
+    Split LaTeX source on \\section / \\subsection headings
+
+    Args:
+        latex_text: Full chapter source
+
+    Returns:
+        List of {"level", "title", "text"} dicts in document order.
+        Text before the first heading is returned as a "preamble" part.
+    """
+    matches = list(SECTION_PATTERN.finditer(latex_text))
+
+    if not matches:
+        return [{"level": "chapter", "title": "(whole text)", "text": latex_text}]
+
+    sections = []
+
+    preamble = latex_text[:matches[0].start()]
+    if preamble.strip():
+        sections.append({"level": "preamble", "title": "(preamble)", "text": preamble})
+
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(latex_text)
+        sections.append({
+            "level": match.group(1),
+            "title": match.group(2).strip(),
+            "text": latex_text[match.start():end]
+        })
+
+    return sections
+
+
+def section_hash(text: str, mode: str, model: str, papers: List[str] = ()) -> str:
+    """Hash a section's content together with review mode, model and papers"""
+    paper_names = "\x01".join(sorted(papers))
+    key = f"{mode}\x00{model}\x00{paper_names}\x00{text.strip()}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class SectionReviewCache:
+    """Cache section review results by content hash"""
+
+    def __init__(self):
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get cached result or None"""
+        with self._lock:
+            return self._cache.get(key)
+
+    def put(self, key: str, result: Dict[str, Any]):
+        """Store a successful review result"""
+        with self._lock:
+            self._cache[key] = result
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def clear(self):
+        """Clear all cached reviews"""
+        with self._lock:
+            self._cache.clear()
+
+
+def merge_section_reviews(reviews: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge per-section results into a single report in document order
+
+    Args:
+        reviews: List of {"section", "result", "cached"} dicts
+
+    Returns:
+        Result dict shaped like ClaudeClient.ask() output, plus "sections"
+    """
+    parts = []
+    models = []
+    input_tokens = output_tokens = 0
+    cost = 0.0
+    failed = 0
+
+    for review in reviews:
+        section = review["section"]
+        result = review["result"]
+        tag = " (cached)" if review["cached"] else ""
+
+        parts.append(f"## {section['title']}{tag}\n")
+
+        if result["success"]:
+            parts.append(result["answer"].strip() + "\n")
+            if result["model"] not in models:
+                models.append(result["model"])
+            if not review["cached"]:
+                input_tokens += result["input_tokens"]
+                output_tokens += result["output_tokens"]
+                cost += result["cost"]
+        else:
+            failed += 1
+            parts.append(f"❌ Review failed: {result.get('error')}\n")
+
+    return {
+        "answer": "\n".join(parts),
+        "model": "+".join(models) if models else "none",
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "cost": cost,
+        "success": failed < len(reviews),
+        "sections": reviews,
+        "cached_sections": sum(1 for r in reviews if r["cached"]),
+        "failed_sections": failed
+    }
@@ -7,8 +7,19 @@ Usage:
     quick_ask("Your question here")
 """
 
-from .config import get_api_key, DRIVE_ROOT, PAPERS_DIR
-from .claude_client import ClaudeClient
+from pathlib import Path
+from .config import (
+    get_api_key,
+    DRIVE_ROOT,
+    PAPERS_DIR,
+    CASCADE,
+    MIRROR_PAPERS,
+    SEMANTIC_CACHE,
+    SEMANTIC_CACHE_THRESHOLD,
+    TRAFFIC_MODE,
+    TRAFFIC_PATH
+)
+from .claude_client import ClaudeClient, create_client
 from .pdf_handler import PDFHandler
 from .prompts import (
     get_latex_review_prompt,
@@ -18,6 +29,15 @@ from .prompts import (
 )
 from .utils import display_response, print_header
 from .cost_tracker import CostTracker
+from .latex_sections import (
+    split_latex_sections,
+    section_hash,
+    merge_section_reviews,
+    SectionReviewCache
+)
+from .equation_index import EquationIndex
+from .cascade import AllChecks, ConfidenceCheck, StructureCheck
+from .traffic import ReplayClient
 from .config import get_api_key, DRIVE_ROOT, PAPERS_DIR  # Add DRIVE_ROOT, PAPERS_DIR here
 
 # ============================================
@@ -27,27 +47,70 @@ from .config import get_api_key, DRIVE_ROOT, PAPERS_DIR  # Add DRIVE_ROOT, PAPER
 _client = None
 _pdf_handler = None
 _tracker = None
+_section_cache = SectionReviewCache()
+_equation_index = None
 
 
-def initialize():
-    """Initialize all components"""
-    global _client, _pdf_handler, _tracker
+def initialize(
+    slim_pdfs: bool = False,
+    mirror: bool = MIRROR_PAPERS,
+    semantic_cache: bool = SEMANTIC_CACHE,
+    cache_threshold: float = SEMANTIC_CACHE_THRESHOLD,
+    traffic: str = TRAFFIC_MODE,
+    traffic_path: str = TRAFFIC_PATH,
+    latency_scale: float = 1.0,
+    replay_strict: bool = False
+):
+    """
+    Initialize all components
+    
+    Args:
+        slim_pdfs: Upload cached slim copies of PDFs (downsampled
+            images, compressed streams); needs pypdf and Pillow
+        mirror: Sync papers to LOCAL_PAPERS_DIR and read from there
+        semantic_cache: Reuse answers of near-duplicate prompts
+        cache_threshold: Similarity (0-1) needed for a cache hit
+        traffic: "record" saves every API call to traffic_path,
+            "replay" serves them back offline (no API key needed),
+            "fake" returns synthetic responses (load tests)
+        traffic_path: Traffic JSONL file
+        latency_scale: Replay latency multiplier (0 = instant);
+            seconds per call for "fake"
+        replay_strict: Fail unrecorded requests on replay instead of
+            answering them with the next recording
+    """
+    global _client, _pdf_handler, _tracker, _equation_index
     
     print("🔧 Initializing Thesis Assistant...\n")
     
     try:
-        api_key = get_api_key()
-        _client = ClaudeClient(api_key)
+        _client = create_client(
+            slim_pdfs=slim_pdfs,
+            mirror=mirror,
+            semantic_cache=semantic_cache,
+            cache_threshold=cache_threshold,
+            traffic=traffic,
+            traffic_path=traffic_path,
+            latency_scale=latency_scale,
+            replay_strict=replay_strict
+        )
         _pdf_handler = _client.pdf_handler
+        
         _tracker = CostTracker()
+        _tracker.semantic_cache = _client.semantic_cache
+        if isinstance(_client.client, ReplayClient):
+            _tracker.replay = _client.client
+        _equation_index = EquationIndex()
         
         print("✅ Initialization complete!")
         print("\n💡 Available functions:")
         print("   • ask_claude(prompt, pdf_paths='all', model='auto')")
         print("   • quick_ask(prompt) - shortcut with all papers")
         print("   • review_latex(latex_text, mode='grammar|rigor|literature')")
+        print("   • review_chapter(latex_text, mode='grammar') - per-section, cached")
         print("   • compare_papers(question)")
         print("   • extract_equations(topic)")
+        print("   • search_equations(query) - offline equation index")
         print("   • find_gaps(research_area)")
         print("   • list_papers() - show available PDFs")
         print("   • show_report() - cost tracking")
@@ -69,7 +132,13 @@ def ask_claude(
     pdf_paths: any = "all",
     model: str = "auto",
     max_tokens: int = 4096,
-    show_response: bool = True
+    show_response: bool = True,
+    cascade: bool = CASCADE,
+    accept=None,
+    use_cache: bool = True,
+    task: str = "ask",
+    cache_key: str = None,
+    verbose: bool = None
 ):
     """
     Ask Claude with papers context
@@ -80,6 +149,14 @@ def ask_claude(
         model: "auto", "sonnet", or "opus"
         max_tokens: Response length (max 4096)
         show_response: Display formatted response
+        cascade: Try Sonnet first when Opus is selected; escalate
+            only if the answer fails `accept` (see cascade.py)
+        accept: Acceptance check for cascade (default: confidence + length)
+        use_cache: Allow answers from the semantic cache (if enabled)
+        task: Prompt template name (semantic cache scope)
+        cache_key: User-supplied part of a templated prompt, compared
+            by the semantic cache instead of the whole prompt
+        verbose: Progress output for this call (default: on)
         
     Returns:
         Response dict with answer, tokens, cost
@@ -96,17 +173,26 @@ def ask_claude(
         prompt=prompt,
         pdf_paths=pdf_paths,
         model=model,
-        max_tokens=max_tokens
+        max_tokens=max_tokens,
+        cascade=cascade,
+        accept=accept,
+        use_cache=use_cache,
+        task=task,
+        cache_key=cache_key,
+        verbose=verbose
     )
     
-    # Track if successful
-    if result["success"] and _tracker:
+    # Track successful and paid-for failed calls (cache hits cost nothing)
+    paid = result["success"] or result.get("cost")
+    if paid and _tracker and not result.get("cache_hit"):
         _tracker.add(
             model=result["model"],
             input_tokens=result["input_tokens"],
             output_tokens=result["output_tokens"],
             cost=result["cost"],
-            question_preview=prompt
+            question_preview=prompt,
+            latency=result.get("latency"),
+            cascade=result.get("cascade")
         )
     
     # Display
@@ -116,17 +202,23 @@ def ask_claude(
     return result
 
 
-def quick_ask(prompt: str, model: str = "auto"):
+def quick_ask(prompt: str, model: str = "auto", show_response: bool = True):
     """
     Quick ask with all papers (shortcut)
     
     Example:
         quick_ask("Tổng hợp các phương pháp deep hedging")
     """
-    return ask_claude(prompt, pdf_paths="all", model=model)
+    return ask_claude(prompt, pdf_paths="all", model=model, show_response=show_response)
 
 
-def review_latex(latex_text: str, mode: str = "grammar", model: str = "auto"):
+def review_latex(
+    latex_text: str,
+    mode: str = "grammar",
+    model: str = "auto",
+    chapter: bool = False,
+    show_response: bool = True
+):
     """
     Review LaTeX section
     
@@ -134,16 +226,109 @@ def review_latex(latex_text: str, mode: str = "grammar", model: str = "auto"):
         latex_text: LaTeX code to review
         mode: "grammar", "rigor", or "literature"
         model: Which model to use (default: auto)
+        chapter: Review section by section (see review_chapter)
+        show_response: Display formatted response
         
     Example:
         latex = r"\\section{Introduction}\\nThe SB problem..."
         review_latex(latex, mode="rigor", model="opus")
     """
+    if chapter:
+        return review_chapter(
+            latex_text, mode=mode, model=model, show_response=show_response
+        )
+    
+    # LaTeX must match exactly: no near-duplicate answers
     prompt = get_latex_review_prompt(latex_text, mode)
-    return ask_claude(prompt, pdf_paths="all", model=model)
+    return ask_claude(
+        prompt, pdf_paths="all", model=model,
+        show_response=show_response, use_cache=False
+    )
+
+
+def review_chapter(
+    latex_text: str,
+    mode: str = "grammar",
+    model: str = "auto",
+    max_workers: int = 4,
+    show_response: bool = True
+):
+    """
+    Review a whole chapter section by section
+    
+    Splits the source on \\section / \\subsection, reviews sections
+    concurrently and merges the results in document order. Reviews are
+    cached by section content, so after an edit only changed sections
+    are sent again.
+    
+    Calls in flight: up to max_workers per chapter. When several
+    chapters run at once (batch runner with -j N), that is up to
+    N × max_workers; lower max_workers in the job args to bound it.
+    
+    Args:
+        latex_text: Full chapter LaTeX source
+        mode: "grammar", "rigor", or "literature"
+        model: Which model to use (default: auto)
+        max_workers: Number of sections reviewed in parallel
+        show_response: Display merged report
+        
+    Returns:
+        Merged response dict with per-section results under "sections"
+        
+    Example:
+        chapter = open("chapter3.tex").read()
+        review_chapter(chapter, mode="rigor")
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    
+    if _client is None:
+        print("❌ Not initialized. Run initialize() first.")
+        return None
+    
+    sections = split_latex_sections(latex_text)
+    
+    # Reviews depend on the papers too (literature/rigor modes)
+    papers = [Path(p).name for p in _pdf_handler.resolve_pdf_paths("all")]
+    keys = [section_hash(s["text"], mode, model, papers) for s in sections]
+    
+    reviews = [None] * len(sections)
+    pending = []
+    for i, key in enumerate(keys):
+        cached = _section_cache.get(key)
+        if cached is not None:
+            reviews[i] = {"section": sections[i], "result": cached, "cached": True}
+        else:
+            pending.append(i)
+    
+    print(f"📑 {len(sections)} sections: {len(sections) - len(pending)} cached, "
+          f"{len(pending)} to review")
+    
+    def _review(i):
+        prompt = get_latex_review_prompt(sections[i]["text"], mode)
+        # Quiet per call: parallel progress output would interleave
+        return ask_claude(
+            prompt, pdf_paths="all", model=model,
+            show_response=False, use_cache=False, verbose=False
+        )
+    
+    if pending:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            results = list(pool.map(_review, pending))
+        
+        for i, result in zip(pending, results):
+            if result["success"]:
+                _section_cache.put(keys[i], result)
+            reviews[i] = {"section": sections[i], "result": result, "cached": False}
+    
+    merged = merge_section_reviews(reviews)
+    
+    if show_response and merged["success"]:
+        display_response(merged)
+    
+    return merged
 
 
-def compare_papers(question: str, model: str = "sonnet"):
+def compare_papers(question: str, model: str = "sonnet", show_response: bool = True):
     """
     Compare approaches across all papers
     
@@ -151,10 +336,13 @@ def compare_papers(question: str, model: str = "sonnet"):
         compare_papers("How to price rainbow options?")
     """
     prompt = get_compare_papers_prompt(question)
-    return ask_claude(prompt, pdf_paths="all", model=model)
+    return ask_claude(
+        prompt, pdf_paths="all", model=model, show_response=show_response,
+        task="compare_papers", cache_key=question
+    )
 
 
-def extract_equations(topic: str):
+def extract_equations(topic: str, show_response: bool = True):
     """
     Extract equations from papers
     
@@ -162,18 +350,97 @@ def extract_equations(topic: str):
         extract_equations("Forward-Backward SDE")
     """
     prompt = get_extract_equations_prompt(topic)
-    return ask_claude(prompt, pdf_paths="all", model="sonnet")
+    # Topics must match exactly: the answer is indexed under this topic
+    result = ask_claude(
+        prompt, pdf_paths="all", model="sonnet",
+        show_response=show_response, use_cache=False
+    )
+    
+    # Keep structured output for offline search_equations()
+    if (result and result["success"] and not result.get("cache_hit")
+            and _equation_index is not None):
+        added = _equation_index.add_extraction(topic, result["answer"])
+        print(f"🗂️  Indexed {added} equations for '{topic}'")
+    
+    return result
 
 
-def find_gaps(research_area: str):
+def search_equations(
+    query: str,
+    limit: int = 10,
+    fetch_missing: bool = True,
+    index_pdfs: bool = True
+):
+    """
+    Search equations in the local index
+    
+    Answers from equations indexed by past extract_equations() runs
+    and the local PDF text layer. Calls the API (extract_equations)
+    only if the query is not covered yet and fetch_missing is True.
+    
+    Args:
+        query: Topic or keywords, e.g. "Forward-Backward SDE"
+        limit: Maximum results
+        fetch_missing: Run extract_equations() for uncovered topics
+        index_pdfs: Index text of new/changed local PDFs first
+        
+    Returns:
+        List of matching entries (equation, paper, page, context, score)
+        
+    Example:
+        search_equations("Schrödinger potentials")
+    """
+    if _equation_index is None:
+        print("❌ Not initialized. Run initialize() first.")
+        return None
+    
+    if index_pdfs:
+        _equation_index.add_pdf_text(_pdf_handler.get_all_pdfs())
+    
+    hits = _equation_index.search(query, limit=limit)
+    covered = _equation_index.is_covered(query) or any(
+        h["source"] == "extraction" and h["score"] == 1.0 for h in hits
+    )
+    
+    if not covered and fetch_missing:
+        print(f"🔎 '{query}' not in index yet - extracting...")
+        extract_equations(query)
+        hits = _equation_index.search(query, limit=limit)
+    
+    print(f"\n🗂️  {len(hits)} equations for '{query}' "
+          f"(index: {len(_equation_index)} entries)")
+    for i, h in enumerate(hits, 1):
+        page = f" p.{h['page']}" if h.get("page") else ""
+        print(f"  {i:2d}. [{h.get('paper') or '?'}{page}] {h['equation'][:100]}")
+    
+    return hits
+
+
+def find_gaps(
+    research_area: str,
+    show_response: bool = True,
+    cascade: bool = CASCADE
+):
     """
     Find research gaps for thesis
     
     Example:
         find_gaps("Multivariate Schrödinger Bridge for exotic options")
+        find_gaps("Deep hedging", cascade=True)  # Sonnet first
     """
     prompt = get_gap_analysis_prompt(research_area)
-    return ask_claude(prompt, pdf_paths="all", model="opus")
+    
+    # Sonnet's answer must be confident and cover all five sections
+    accept = AllChecks(
+        ConfidenceCheck(0.8),
+        StructureCheck([rf"^\W*{n}[.)]" for n in range(1, 6)])
+    )
+    
+    return ask_claude(
+        prompt, pdf_paths="all", model="opus",
+        show_response=show_response, cascade=cascade, accept=accept,
+        task="find_gaps", cache_key=research_area
+    )
 
 
 # ============================================
@@ -189,6 +456,15 @@ def list_papers():
     _pdf_handler.print_pdfs()
 
 
+def show_slim_report():
+    """Show bytes saved per paper by PDF slimming"""
+    if _pdf_handler is None:
+        print("❌ Not initialized. Run initialize() first.")
+        return
+    
+    _pdf_handler.print_slim_report()
+
+
 def show_report():
     """Show session cost and usage report"""
     if _tracker is None:
@@ -0,0 +1,74 @@
+"""
+Local mirror of the papers directory (Drive FUSE -> local disk)
+"""
+
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Any
+
+
+def _is_current(src: Path, dst: Path) -> bool:
+    """Same size and modification time -> no copy needed"""
+    if not dst.exists():
+        return False
+    src_stat, dst_stat = src.stat(), dst.stat()
+    return (
+        src_stat.st_size == dst_stat.st_size and
+        int(src_stat.st_mtime) == int(dst_stat.st_mtime)
+    )
+
+
+def sync_papers(
+    source_dir: str,
+    local_dir: str,
+    pattern: str = "*.pdf",
+    delete: bool = True
+) -> Dict[str, Any]:
+    """
+    Copy new/changed papers from source_dir into local_dir
+
+    Files are compared by size and mtime (copy2 preserves mtime), copied
+    to a temporary name and renamed, so an interrupted sync never leaves
+    a truncated PDF behind.
+
+    Args:
+        source_dir: Directory to mirror (e.g. Drive papers folder)
+        local_dir: Local destination (e.g. /content/papers)
+        pattern: Glob of files to mirror
+        delete: Remove local files no longer present in source_dir
+
+    Returns:
+        Dict with copied, skipped, removed counts and bytes copied
+    """
+    source = Path(source_dir)
+    local = Path(local_dir)
+    local.mkdir(parents=True, exist_ok=True)
+
+    stats = {"copied": 0, "skipped": 0, "removed": 0, "bytes": 0}
+    names = set()
+
+    for src in source.glob(pattern):
+        if not src.is_file():
+            continue
+        names.add(src.name)
+        dst = local / src.name
+
+        if _is_current(src, dst):
+            stats["skipped"] += 1
+            continue
+
+        tmp = local / f".{src.name}.part"
+        shutil.copy2(src, tmp)
+        os.replace(tmp, dst)
+
+        stats["copied"] += 1
+        stats["bytes"] += dst.stat().st_size
+
+    if delete:
+        for dst in local.glob(pattern):
+            if dst.name not in names:
+                dst.unlink()
+                stats["removed"] += 1
+
+    return stats
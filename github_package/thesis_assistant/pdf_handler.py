@@ -3,18 +3,42 @@ PDF handling utilities
 """
 
 import base64
+import hashlib
 import os
+import threading
 from pathlib import Path
-from typing import List, Optional
-from .config import PAPERS_DIR
+from typing import List, Optional, Dict, Tuple
+from .config import (
+    PAPERS_DIR,
+    SLIM_CACHE_DIR,
+    SLIM_MAX_IMAGE_DIM,
+    SLIM_IMAGE_QUALITY
+)
 
 
 class PDFHandler:
     """Handle PDF loading and encoding"""
     
-    def __init__(self, papers_dir: str = PAPERS_DIR):
+    def __init__(
+        self,
+        papers_dir: str = PAPERS_DIR,
+        slim: bool = False,
+        slim_dir: str = SLIM_CACHE_DIR,
+        max_image_dim: int = SLIM_MAX_IMAGE_DIM,
+        image_quality: int = SLIM_IMAGE_QUALITY
+    ):
         self.papers_dir = Path(papers_dir)
         self._cache = {}  # Cache encoded PDFs
+        self._lock = threading.Lock()  # Guards _cache and _path_locks
+        self._path_locks = {}  # One lock per PDF path
+        self.verbose = True
+        
+        # Optional slimming stage before encoding
+        self.slim = slim
+        self.slim_dir = Path(slim_dir)
+        self.max_image_dim = max_image_dim
+        self.image_quality = image_quality
+        self.slim_stats: Dict[str, Tuple[int, int]] = {}  # name -> (original, slim) bytes
     
     def list_pdfs(self) -> List[Path]:
         """List all PDFs in directory"""
@@ -42,16 +66,155 @@ class PDFHandler:
             Base64 encoded string
         """
         # Use cache if available
-        if pdf_path in self._cache:
-            return self._cache[pdf_path]
+        cached = self._cache.get(pdf_path)
+        if cached is not None:
+            return cached
+        
+        with self._lock:
+            path_lock = self._path_locks.setdefault(pdf_path, threading.Lock())
         
-        # Encode and cache
-        with open(pdf_path, 'rb') as f:
-            encoded = base64.b64encode(f.read()).decode()
+        # Encode and cache: one thread per file, other files proceed
+        with path_lock:
+            cached = self._cache.get(pdf_path)
+            if cached is not None:
+                return cached
+            
+            source_path = self.slim_pdf(pdf_path) if self.slim else pdf_path
+            with open(source_path, 'rb') as f:
+                encoded = base64.b64encode(f.read()).decode()
+            
+            with self._lock:
+                self._cache[pdf_path] = encoded
         
-        self._cache[pdf_path] = encoded
         return encoded
     
+    def slim_pdf(self, pdf_path: str) -> str:
+        """
+        Rewrite PDF into a cached slim version
+        
+        Downsamples large raster images, compresses content streams and
+        drops duplicate/unreferenced objects. The text layer is checked
+        page by page; if it changed, the original is used instead.
+        Needs pypdf (and Pillow for images).
+        
+        Args:
+            pdf_path: Path to PDF file
+            
+        Returns:
+            Path to slim PDF, or the original path if slimming
+            is unavailable, failed, or did not save bytes
+        """
+        name = Path(pdf_path).name
+        original_size = os.path.getsize(pdf_path)
+        
+        # Cache key: file identity + slimming settings
+        stat = os.stat(pdf_path)
+        key = hashlib.sha256(
+            f"{pdf_path}|{stat.st_mtime}|{stat.st_size}|"
+            f"{self.max_image_dim}|{self.image_quality}".encode()
+        ).hexdigest()[:16]
+        slim_path = self.slim_dir / f"{Path(pdf_path).stem}-{key}.pdf"
+        # Marker: slimming failed for this exact file, don't retry
+        original_marker = slim_path.with_suffix(".original")
+        
+        if original_marker.exists():
+            self.slim_stats[name] = (original_size, original_size)
+            return pdf_path
+        
+        if not slim_path.exists():
+            try:
+                self._write_slim_pdf(pdf_path, slim_path)
+            except ImportError:
+                print("⚠️  pypdf not installed - sending original PDFs (pip install pypdf)")
+                self.slim = False
+                return pdf_path
+            except Exception as e:
+                print(f"⚠️  Could not slim {name}, using original: {e}")
+                self.slim_dir.mkdir(parents=True, exist_ok=True)
+                original_marker.touch()
+                self.slim_stats[name] = (original_size, original_size)
+                return pdf_path
+        
+        slim_size = os.path.getsize(slim_path)
+        if slim_size >= original_size:
+            self.slim_stats[name] = (original_size, original_size)
+            return pdf_path
+        
+        if name not in self.slim_stats:
+            saved = (original_size - slim_size) / 1024 / 1024
+            print(f"  🗜️  {name}: {original_size / 1024 / 1024:.1f} MB → "
+                  f"{slim_size / 1024 / 1024:.1f} MB (saved {saved:.1f} MB)")
+        
+        self.slim_stats[name] = (original_size, slim_size)
+        return str(slim_path)
+    
+    def _write_slim_pdf(self, pdf_path: str, slim_path: Path):
+        """Write slim copy of pdf_path to slim_path (atomically)"""
+        from pypdf import PdfReader, PdfWriter
+        
+        writer = PdfWriter(clone_from=pdf_path)
+        
+        for page in writer.pages:
+            self._downsample_images(page)
+            page.compress_content_streams()
+        
+        # Drop duplicate and unreferenced objects (pypdf >= 5)
+        if hasattr(writer, "compress_identical_objects"):
+            writer.compress_identical_objects(remove_identicals=True, remove_orphans=True)
+        
+        self.slim_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = slim_path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            writer.write(f)
+        
+        # Never change the text layer
+        original = PdfReader(pdf_path)
+        slimmed = PdfReader(str(tmp_path))
+        same_text = len(original.pages) == len(slimmed.pages) and all(
+            a.extract_text() == b.extract_text()
+            for a, b in zip(original.pages, slimmed.pages)
+        )
+        if not same_text:
+            os.remove(tmp_path)
+            raise ValueError("text layer changed after slimming")
+        
+        os.replace(tmp_path, slim_path)
+    
+    def _downsample_images(self, page):
+        """Shrink raster images larger than max_image_dim"""
+        try:
+            images = list(page.images)
+        except Exception:
+            return  # Pillow missing or unsupported image filter
+        
+        for image_file in images:
+            try:
+                image = image_file.image
+                if max(image.size) <= self.max_image_dim:
+                    continue
+                image.thumbnail((self.max_image_dim, self.max_image_dim))
+                if image.mode not in ("RGB", "L"):
+                    image = image.convert("RGB")
+                image_file.replace(image, quality=self.image_quality)
+            except Exception:
+                continue  # Keep the original image
+    
+    def print_slim_report(self):
+        """Print bytes saved per paper by the slimming stage"""
+        if not self.slim_stats:
+            print("🗜️  No PDFs slimmed yet")
+            return
+        
+        total_original = sum(o for o, _ in self.slim_stats.values())
+        total_slim = sum(s for _, s in self.slim_stats.values())
+        
+        print(f"\n🗜️  Slimmed {len(self.slim_stats)} PDFs:")
+        for name, (original, slim) in self.slim_stats.items():
+            saved = (original - slim) / 1024 / 1024
+            print(f"  • {name}: {original / 1024 / 1024:.1f} → "
+                  f"{slim / 1024 / 1024:.1f} MB (saved {saved:.1f} MB)")
+        print(f"  Total saved: {(total_original - total_slim) / 1024 / 1024:.1f} MB")
+    
     def get_all_pdfs(self) -> List[str]:
         """Get paths of all PDFs"""
         return [str(p) for p in self.list_pdfs()]
@@ -73,22 +236,31 @@ class PDFHandler:
         else:
             return pdf_paths
     
-    def build_content(self, prompt: str, pdf_paths: List[str]) -> List[dict]:
+    def build_content(
+        self,
+        prompt: str,
+        pdf_paths: List[str],
+        verbose: Optional[bool] = None
+    ) -> List[dict]:
         """
         Build message content with PDFs
         
         Args:
             prompt: Text prompt
             pdf_paths: List of PDF paths
+            verbose: Print added papers (default: self.verbose)
             
         Returns:
             List of content blocks for Claude API
         """
         content = []
+        if verbose is None:
+            verbose = self.verbose
         
         # Add PDFs
         for pdf_path in pdf_paths:
-            print(f"  📄 Adding: {Path(pdf_path).name}")
+            if verbose:
+                print(f"  📄 Adding: {Path(pdf_path).name}")
             
             content.append({
                 "type": "document",
@@ -106,4 +278,5 @@ class PDFHandler:
     
     def clear_cache(self):
         """Clear PDF encoding cache"""
-        self._cache.clear()
+        with self._lock:
+            self._cache.clear()
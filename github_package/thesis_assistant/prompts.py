@@ -65,6 +65,10 @@ For each equation:
 4. Context of when it's used
 
 Format ready to paste into my thesis.
+
+At the end, add a ```json block listing every equation as
+{{"equation": "<LaTeX>", "paper": "<file name>", "page": <page number or null>, "context": "<one sentence>"}}
+Escape every backslash in the JSON strings (write \\\\frac, not \\frac).
     """
 
 
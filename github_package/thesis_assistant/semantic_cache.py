@@ -0,0 +1,122 @@
+"""
+Near-duplicate prompt cache using local character n-gram TF-IDF
+"""
+
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter
+from typing import List, Dict, Any, Optional, Tuple
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and punctuation, collapse whitespace"""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    text = re.sub(r"[^\w\s]", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def char_ngrams(text: str, n_min: int = 3, n_max: int = 5) -> Counter:
+    """Character n-gram counts of normalized text"""
+    text = f" {normalize(text)} "
+    grams = Counter()
+    for n in range(n_min, n_max + 1):
+        for i in range(len(text) - n + 1):
+            grams[text[i:i + n]] += 1
+    return grams
+
+
+class SemanticCache:
+    """Return a previous answer when a new prompt is a near-duplicate"""
+
+    def __init__(self, threshold: float = 0.9, max_entries: int = 500):
+        """
+        Args:
+            threshold: Minimum cosine similarity (0-1) for a hit
+            max_entries: Oldest entries are dropped beyond this
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.entries: List[Dict[str, Any]] = []
+        self.lookups = 0
+        self.hits = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, prompt: str, scope: Tuple) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        Find the most similar cached prompt with the same scope
+
+        Args:
+            prompt: New prompt
+            scope: Hashable key, e.g. (model, document names)
+
+        Returns:
+            (entry, similarity) if similarity >= threshold, else None
+        """
+        with self._lock:
+            self.lookups += 1
+            candidates = [e for e in self.entries if e["scope"] == scope]
+            if not candidates:
+                return None
+
+            query = char_ngrams(prompt)
+            idf = self._idf([query] + [e["grams"] for e in candidates])
+            query_vec = self._tfidf(query, idf)
+
+            best, best_sim = None, 0.0
+            for entry in candidates:
+                sim = self._cosine(query_vec, self._tfidf(entry["grams"], idf))
+                if sim > best_sim:
+                    best, best_sim = entry, sim
+
+            if best is None or best_sim < self.threshold:
+                return None
+
+            self.hits += 1
+            return best, best_sim
+
+    def store(self, prompt: str, scope: Tuple, result: Dict[str, Any]):
+        """Cache a successful result"""
+        with self._lock:
+            self.entries.append({
+                "prompt": prompt,
+                "scope": scope,
+                "grams": char_ngrams(prompt),
+                "result": dict(result)
+            })
+            if len(self.entries) > self.max_entries:
+                self.entries = self.entries[-self.max_entries:]
+
+    @property
+    def hit_rate(self) -> Optional[float]:
+        """Fraction of lookups served from cache"""
+        return self.hits / self.lookups if self.lookups else None
+
+    def clear(self):
+        """Drop all cached answers and statistics"""
+        with self._lock:
+            self.entries.clear()
+            self.lookups = self.hits = 0
+
+    @staticmethod
+    def _idf(documents: List[Counter]) -> Dict[str, float]:
+        """Smoothed inverse document frequency"""
+        df = Counter()
+        for doc in documents:
+            df.update(doc.keys())
+        n = len(documents)
+        return {g: math.log((1 + n) / (1 + c)) + 1 for g, c in df.items()}
+
+    @staticmethod
+    def _tfidf(grams: Counter, idf: Dict[str, float]) -> Dict[str, float]:
+        return {g: c * idf.get(g, 1.0) for g, c in grams.items()}
+
+    @staticmethod
+    def _cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+        if len(a) > len(b):
+            a, b = b, a
+        dot = sum(v * b.get(g, 0.0) for g, v in a.items())
+        norm = math.sqrt(sum(v * v for v in a.values())) * math.sqrt(sum(v * v for v in b.values()))
+        return dot / norm if norm else 0.0
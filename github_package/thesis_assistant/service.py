@@ -0,0 +1,363 @@
+"""
+Local multi-user HTTP service
+
+Usage:
+    python -m thesis_assistant serve --port 8765 --workers 4 --queue 32
+    python -m thesis_assistant serve --fake 1.0        # load test, no API calls
+
+    curl -X POST localhost:8765/ask -H 'X-Tenant: alice' \\
+         -d '{"task": "quick_ask", "prompt": "Summarize the papers"}'
+    curl localhost:8765/report?tenant=alice
+    curl localhost:8765/health
+
+One ClaudeClient (PDF cache, semantic cache) is shared by all requests.
+API calls run on a bounded worker pool; requests beyond workers + queue
+are rejected with 429. Costs are tracked per tenant.
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+from .claude_client import ClaudeClient, create_client
+from .cost_tracker import CostTracker
+from .prompts import (
+    get_latex_review_prompt,
+    get_compare_papers_prompt,
+    get_extract_equations_prompt,
+    get_gap_analysis_prompt
+)
+from .traffic import ReplayClient
+
+
+# Task -> (prompt builder, argument names, default model)
+# The first argument is what the semantic cache compares.
+TASKS = {
+    "ask": (lambda prompt: prompt, ["prompt"], "auto"),
+    "quick_ask": (lambda prompt: prompt, ["prompt"], "auto"),
+    "review_latex": (get_latex_review_prompt, ["latex_text", "mode"], "auto"),
+    "compare_papers": (get_compare_papers_prompt, ["question"], "sonnet"),
+    "extract_equations": (get_extract_equations_prompt, ["topic"], "sonnet"),
+    "find_gaps": (get_gap_analysis_prompt, ["research_area"], "opus"),
+}
+
+# Inputs that must match exactly: never served from the semantic cache
+EXACT_TASKS = {"review_latex", "extract_equations"}
+
+RESULT_KEYS = [
+    "answer", "model", "input_tokens", "output_tokens", "cost",
+    "latency", "cascade", "cache_hit", "error", "success"
+]
+
+
+def replay_stats(client: ClaudeClient) -> Optional[Dict[str, int]]:
+    """Matched/unmatched counts when replaying recorded traffic"""
+    transport = client.client
+    if not isinstance(transport, ReplayClient):
+        return None
+    return {"matched": transport.matched, "unmatched": transport.unmatched}
+
+
+class QueueFullError(Exception):
+    """Worker pool and queue are at capacity"""
+
+
+class ThesisService:
+    """Shared client + bounded worker pool + per-tenant cost tracking"""
+
+    def __init__(self, client: ClaudeClient, max_workers: int = 4, max_queue: int = 32):
+        """
+        Args:
+            client: Shared client (its PDF and semantic caches are reused)
+            max_workers: API calls in flight
+            max_queue: Requests allowed to wait for a worker
+        """
+        self.client = client
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+
+        self.trackers: Dict[str, CostTracker] = {}
+        self._lock = threading.Lock()
+        self.stats = {"accepted": 0, "rejected": 0, "completed": 0, "pending": 0}
+
+    def tracker(self, tenant: str) -> CostTracker:
+        """Cost tracker of a tenant (created on first use)"""
+        with self._lock:
+            if tenant not in self.trackers:
+                self.trackers[tenant] = CostTracker()
+            return self.trackers[tenant]
+
+    def submit(self, tenant: str, task: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run one task on the worker pool and wait for the result
+
+        Raises:
+            QueueFullError: all workers busy and queue full
+            ValueError: unknown task or bad arguments
+        """
+        prompt, ask_kwargs = self._build(task, args)
+        ask_kwargs["pdf_paths"] = self._resolve_papers(args.get("pdf_paths", "all"))
+
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.stats["rejected"] += 1
+            raise QueueFullError(
+                f"{self.max_workers} workers busy and {self.max_queue} requests queued"
+            )
+
+        with self._lock:
+            self.stats["accepted"] += 1
+            self.stats["pending"] += 1
+
+        enqueued = time.time()
+        try:
+            future = self._pool.submit(self._run, enqueued, prompt, ask_kwargs)
+            result, queue_wait = future.result()
+        finally:
+            self._slots.release()
+            with self._lock:
+                self.stats["pending"] -= 1
+                self.stats["completed"] += 1
+
+        # Track per tenant: successful and paid-for failed calls
+        # (cache hits cost nothing)
+        paid = result["success"] or result.get("cost")
+        if paid and not result.get("cache_hit"):
+            self.tracker(tenant).add(
+                model=result["model"],
+                input_tokens=result["input_tokens"],
+                output_tokens=result["output_tokens"],
+                cost=result["cost"],
+                question_preview=prompt.strip(),
+                latency=result.get("latency"),
+                cascade=result.get("cascade")
+            )
+
+        response = {k: result[k] for k in RESULT_KEYS if k in result}
+        response["queue_wait"] = round(queue_wait, 3)
+        return response
+
+    def health(self) -> Dict[str, Any]:
+        """Pool and cache status"""
+        cache = self.client.semantic_cache
+        with self._lock:
+            return dict(
+                self.stats,
+                workers=self.max_workers,
+                max_queue=self.max_queue,
+                tenants=len(self.trackers),
+                cached_pdfs=len(self.client.pdf_handler._cache),
+                cache_hit_rate=cache.hit_rate if cache else None,
+                replay=replay_stats(self.client)
+            )
+
+    def report(self, tenant: str = None) -> Optional[Dict[str, Any]]:
+        """Cost summary of one tenant (None if unknown), or of all tenants"""
+        with self._lock:
+            if tenant is not None:
+                tracker = self.trackers.get(tenant)
+                trackers = {tenant: tracker} if tracker else None
+            else:
+                trackers = dict(self.trackers)
+        if trackers is None:
+            return None
+        return {t: tracker.get_summary() for t, tracker in trackers.items()}
+
+    def shutdown(self):
+        """Stop accepting work and wait for running calls"""
+        self._pool.shutdown(wait=True)
+
+    def _run(self, enqueued: float, prompt: str, ask_kwargs: Dict[str, Any]) -> Tuple[Dict, float]:
+        queue_wait = time.time() - enqueued
+        return self.client.ask(prompt, **ask_kwargs), queue_wait
+
+    def _resolve_papers(self, pdf_paths) -> List[str]:
+        """
+        Map requested paper names to files in the papers directory
+
+        Only names from list_pdfs() are accepted, so clients cannot make
+        the server read (and upload) arbitrary files.
+        """
+        available = {p.name: str(p) for p in self.client.pdf_handler.list_pdfs()}
+
+        if pdf_paths == "all":
+            return list(available.values())
+        if pdf_paths is None:
+            return []
+        if not isinstance(pdf_paths, list) or not all(isinstance(p, str) for p in pdf_paths):
+            raise ValueError('pdf_paths must be "all", null or a list of paper names')
+
+        unknown = [p for p in pdf_paths if p not in available]
+        if unknown:
+            raise ValueError(f"unknown paper(s): {', '.join(unknown)} (see list_papers)")
+        return [available[p] for p in pdf_paths]
+
+    @staticmethod
+    def _build(task: str, args: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Prompt and ClaudeClient.ask() arguments for a task (validated)"""
+        if task not in TASKS:
+            raise ValueError(f"unknown task {task!r} (available: {', '.join(sorted(TASKS))})")
+
+        builder, names, default_model = TASKS[task]
+        required = [n for n in names if n != "mode"]
+        missing = [n for n in required if n not in args]
+        if missing:
+            raise ValueError(f"missing argument(s) for {task}: {', '.join(missing)}")
+        wrong = [n for n in names if n in args and not isinstance(args[n], str)]
+        if wrong:
+            raise ValueError(f"argument(s) must be strings: {', '.join(wrong)}")
+
+        model = args.get("model", default_model)
+        if model not in ("auto", "sonnet", "opus"):
+            raise ValueError("model must be 'auto', 'sonnet' or 'opus'")
+        cascade = args.get("cascade", False)
+        if not isinstance(cascade, bool):
+            raise ValueError("cascade must be true or false")
+
+        prompt = builder(*[args[n] for n in names if n in args])
+        ask_kwargs = {
+            "model": model,
+            "cascade": cascade,
+            "task": "ask" if task == "quick_ask" else task,
+            "cache_key": args[names[0]],
+            "use_cache": task not in EXACT_TASKS,
+        }
+        if "max_tokens" in args:
+            max_tokens = args["max_tokens"]
+            if isinstance(max_tokens, bool) or not isinstance(max_tokens, int) or max_tokens < 1:
+                raise ValueError("max_tokens must be a positive integer")
+            ask_kwargs["max_tokens"] = max_tokens
+        return prompt, ask_kwargs
+
+
+def make_handler(service: ThesisService):
+    """Request handler class bound to a service"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+
+            if url.path == "/health":
+                self._send(200, service.health())
+            elif url.path == "/report":
+                tenant = query.get("tenant", [None])[0]
+                report = service.report(tenant)
+                if report is None:
+                    self._send(404, {"error": f"unknown tenant: {tenant}"})
+                else:
+                    self._send(200, report)
+            else:
+                self._send(404, {"error": f"not found: {url.path}"})
+
+        def do_POST(self):
+            if urlparse(self.path).path != "/ask":
+                self._send(404, {"error": f"not found: {self.path}"})
+                return
+
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+            except ValueError:
+                length = -1
+            if length < 0:
+                # read(-1) would block until the client closes the connection
+                self._send(400, {"error": "invalid Content-Length"})
+                return
+
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError as e:
+                self._send(400, {"error": f"invalid JSON: {e}"})
+                return
+
+            if not isinstance(body, dict):
+                self._send(400, {"error": "request body must be a JSON object"})
+                return
+
+            tenant = body.pop("tenant", None)
+            tenant = self.headers.get("X-Tenant") or tenant or "default"
+            task = body.pop("task", "ask")
+            if not isinstance(tenant, str) or not isinstance(task, str):
+                self._send(400, {"error": "tenant and task must be strings"})
+                return
+
+            try:
+                result = service.submit(tenant, task, body)
+            except QueueFullError as e:
+                self._send(429, {"error": str(e)}, {"Retry-After": "1"})
+                return
+            except ValueError as e:
+                self._send(400, {"error": str(e)})
+                return
+            except Exception as e:
+                self._send(500, {"error": f"{type(e).__name__}: {e}"})
+                return
+
+            self._send(200 if result["success"] else 502, result)
+
+        def _send(self, status: int, payload: Dict[str, Any], headers: Dict[str, str] = None):
+            data = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass  # Quiet; use /health and /report instead
+
+    return Handler
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    max_workers: int = 4,
+    max_queue: int = 32,
+    **client_kwargs
+):
+    """
+    Build a client and serve it over HTTP until interrupted
+
+    Args:
+        host: Bind address (default: localhost only)
+        port: TCP port
+        max_workers: API calls in flight
+        max_queue: Requests allowed to wait for a worker
+        **client_kwargs: Passed to create_client() (e.g. traffic="fake")
+    """
+    try:
+        client = create_client(**client_kwargs)
+    except Exception as e:
+        print(f"❌ Could not start service: {e}")
+        return
+
+    # Concurrent requests: per-call progress output would interleave
+    client.verbose = False
+    client.pdf_handler.verbose = False
+
+    service = ThesisService(client, max_workers=max_workers, max_queue=max_queue)
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    server.daemon_threads = True
+
+    print(f"\n🌐 Serving on http://{host}:{port} "
+          f"({max_workers} workers, queue {max_queue})")
+    print("   POST /ask  ·  GET /report[?tenant=]  ·  GET /health")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Shutting down...")
+    finally:
+        server.server_close()
+        service.shutdown()
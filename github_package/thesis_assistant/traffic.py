@@ -0,0 +1,232 @@
+"""
+Record/replay of API traffic for offline, reproducible performance runs
+
+Usage:
+    initialize(traffic="record", traffic_path="traffic.jsonl")   # real calls, saved
+    initialize(traffic="replay", traffic_path="traffic.jsonl")   # no network, no cost
+    initialize(traffic="fake")                                   # synthetic responses
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from types import SimpleNamespace
+from typing import List, Dict, Any
+
+
+def request_key(model: str, messages: List[Dict[str, Any]]) -> str:
+    """
+    Hash of the model and message content
+
+    Document blocks are hashed by their data, so the (large) base64
+    payloads never have to be stored in the recording.
+    """
+    digest = hashlib.sha256(model.encode())
+    for message in messages:
+        content = message["content"]
+        blocks = content if isinstance(content, list) else [{"type": "text", "text": content}]
+        for block in blocks:
+            if block.get("type") == "document":
+                digest.update(b"doc:" + block["source"]["data"].encode())
+            else:
+                digest.update(b"text:" + block.get("text", "").encode())
+    return digest.hexdigest()
+
+
+def request_metadata(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape of a messages.create request (without PDF payloads)"""
+    documents = 0
+    document_bytes = 0
+    prompt = ""
+    for message in kwargs.get("messages", []):
+        content = message["content"]
+        if isinstance(content, str):
+            prompt = content
+            continue
+        for block in content:
+            if block.get("type") == "document":
+                documents += 1
+                document_bytes += len(block["source"]["data"])
+            elif block.get("type") == "text":
+                prompt = block["text"]
+
+    return {
+        "model": kwargs.get("model"),
+        "max_tokens": kwargs.get("max_tokens"),
+        "temperature": kwargs.get("temperature"),
+        "documents": documents,
+        "document_bytes": document_bytes,
+        "prompt_chars": len(prompt),
+        "prompt_preview": prompt.strip()[:100]
+    }
+
+
+def _response(record: Dict[str, Any]) -> SimpleNamespace:
+    """Rebuild an object shaped like anthropic's Message"""
+    data = record["response"]
+    return SimpleNamespace(
+        content=[SimpleNamespace(type="text", text=data["text"])],
+        usage=SimpleNamespace(
+            input_tokens=data["input_tokens"],
+            output_tokens=data["output_tokens"]
+        ),
+        model=record["request"]["model"],
+        stop_reason=data.get("stop_reason")
+    )
+
+
+class _Messages:
+    """messages namespace: forwards create() to the owning transport"""
+
+    def __init__(self, create):
+        self.create = create
+
+
+class RecordingClient:
+    """Wrap an anthropic client and append every call to a JSONL file"""
+
+    def __init__(self, client, path: str):
+        self.client = client
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.messages = _Messages(self._create)
+        self._lock = threading.Lock()
+
+    def _create(self, **kwargs):
+        record = {
+            "key": request_key(kwargs["model"], kwargs["messages"]),
+            "request": request_metadata(kwargs),
+            "started": time.time()
+        }
+
+        start = time.time()
+        try:
+            response = self.client.messages.create(**kwargs)
+        except Exception as e:
+            record["latency"] = time.time() - start
+            record["error"] = f"{type(e).__name__}: {e}"
+            self._append(record)
+            raise
+
+        record["latency"] = time.time() - start
+        record["response"] = {
+            "text": response.content[0].text,
+            "input_tokens": response.usage.input_tokens,
+            "output_tokens": response.usage.output_tokens,
+            "stop_reason": getattr(response, "stop_reason", None)
+        }
+        self._append(record)
+        return response
+
+    def _append(self, record: Dict[str, Any]):
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+class ReplayError(Exception):
+    """Recorded API error, raised again on replay"""
+
+
+class ReplayClient:
+    """Serve recorded responses without network access"""
+
+    def __init__(self, path: str, latency_scale: float = 1.0, strict: bool = False):
+        """
+        Args:
+            path: JSONL file written by RecordingClient
+            latency_scale: Multiply recorded latency (0 = no sleeping)
+            strict: Raise KeyError for unrecorded requests instead of
+                serving the next recording in order
+        """
+        self.latency_scale = latency_scale
+        self.strict = strict
+        self.messages = _Messages(self._create)
+        self._lock = threading.Lock()
+
+        self.records: List[Dict[str, Any]] = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    self.records.append(json.loads(line))
+
+        if not self.records:
+            raise ValueError(f"No recorded traffic in {path}")
+
+        self._by_key: Dict[str, deque] = defaultdict(deque)
+        for record in self.records:
+            self._by_key[record["key"]].append(record)
+        self._next = 0
+        self.matched = 0
+        self.unmatched = 0
+
+    def _create(self, **kwargs):
+        key = request_key(kwargs["model"], kwargs["messages"])
+
+        with self._lock:
+            queue = self._by_key.get(key)
+            if queue:
+                # Cycle through repeated recordings of the same request
+                record = queue[0]
+                queue.rotate(-1)
+                self.matched += 1
+            else:
+                self.unmatched += 1
+                if self.strict:
+                    raise KeyError(f"No recording for request {key[:12]}")
+                # Keep the traffic shape: next recording in original order
+                record = self.records[self._next % len(self.records)]
+                self._next += 1
+
+        if self.latency_scale > 0:
+            time.sleep(record["latency"] * self.latency_scale)
+
+        if "error" in record:
+            raise ReplayError(record["error"])
+
+        return _response(record)
+
+
+class FakeClient:
+    """Synthetic API backend for local load tests (no recording needed)"""
+
+    def __init__(
+        self,
+        latency: float = 1.0,
+        output_tokens: int = 500,
+        tokens_per_document: int = 20_000
+    ):
+        """
+        Args:
+            latency: Seconds per call
+            output_tokens: Reported output tokens per call
+            tokens_per_document: Reported input tokens per PDF
+        """
+        self.latency = latency
+        self.output_tokens = output_tokens
+        self.tokens_per_document = tokens_per_document
+        self.messages = _Messages(self._create)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _create(self, **kwargs):
+        request = request_metadata(kwargs)
+
+        with self._lock:
+            self.calls += 1
+
+        time.sleep(self.latency)
+
+        return _response({
+            "request": request,
+            "response": {
+                "text": f"[fake {request['model']}] {request['prompt_preview']}",
+                "input_tokens": request["prompt_chars"] // 4 +
+                                request["documents"] * self.tokens_per_document,
+                "output_tokens": self.output_tokens,
+                "stop_reason": "end_turn"
+            }
+        })